@@ -3,6 +3,7 @@ from tkinter import filedialog, messagebox, simpledialog, ttk
 from PIL import Image, ImageTk
 import subprocess
 import platform
+import threading
 import re
 import time
 import json
@@ -17,6 +18,7 @@ import sys
 
 try:
     import pywifi
+    from pywifi import const as pywifi_const
     HAS_PYWIFI = True
 except ImportError:
     HAS_PYWIFI = False
@@ -36,11 +38,42 @@ if args.log_level != 'DEBUG':
     logging.getLogger('pywifi').setLevel(logging.WARNING)
 
 matplotlib.use('TkAgg')
+
+# Longest-side pixel budget for the interpolation grid. Keeps heatmap cost
+# bounded regardless of how large the loaded floor plan is.
+HEATMAP_GRID_TARGET = 512
+
+# exp(x * LN10 / 10) == 10 ** (x / 10); routing dBm->mW conversions through
+# np.exp skips NumPy's generic power path.
+LN10 = np.log(10.0)
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.colors import LinearSegmentedColormap
 import os
 
+# Matplotlib Color Map Definition:
+# Values scale from [0.0 to 1.0] representing 0% to 100%.
+# - > 75% Good signal
+# - < 75% and > 50% Acceptable signal
+# - < 50% and > 40% Weak signal
+# - < 40% Unreliable signal
+# Built once at import time; matplotlib caches the lookup table inside the
+# colormap, so every heatmap window reuses the same LUT instead of
+# rebuilding it per render.
+WIFI_CMAP = LinearSegmentedColormap.from_list('wifi_cmap',[
+    (0.00, 'black'),
+    (0.34, 'black'),
+    (0.35, 'red'),
+    (0.75, 'blue'),
+    (1.00, 'green')
+])
+
+# Marker styles shared by every draw call, built once next to the colormap
+# instead of re-created for each click or redraw.
+MEASUREMENT_MARKER = dict(color='red', marker='o', linestyle='', markersize=6, markeredgecolor='black')
+CALIBRATION_MARKER = dict(color='blue', marker='x', linestyle='', markersize=10, markeredgewidth=2)
+
 def channel_to_freq(channel):
     """Convert Wi-Fi channel to theoretical center frequency in MHz."""
     try:
@@ -76,6 +109,9 @@ class WifiHeatmapApp:
         
         self.image_path = None
         self.original_image = None
+        # Lazily-built base64 PNG of the current map, reused across session
+        # saves so the image is only re-encoded when it actually changes.
+        self._image_b64 = None
         self.img_width = 0
         self.img_height = 0
         
@@ -83,9 +119,30 @@ class WifiHeatmapApp:
         self.pixels_per_meter = None
         
         self.measurements =[]
-        
-        self.state = 'IDLE' 
-        
+        # Fast lookup of the strongest reading per (x, y, ssid), so heatmap
+        # generation never has to linearly re-scan the measurement history.
+        self._measurement_idx = {}
+        # Every SSID seen so far, maintained incrementally as measurements
+        # arrive so the dropdown never re-walks the full history.
+        self._all_ssids = set()
+        # Measurement coordinates kept as parallel structure-of-arrays lists;
+        # redrawing feeds them straight to matplotlib without rebuilding them
+        # from the per-point dicts each time.
+        self._meas_x =[]
+        self._meas_y =[]
+        # Single reusable artist holding every measurement marker; new points
+        # extend its data instead of adding one artist per click.
+        self._meas_line = None
+
+        self.state = 'IDLE'
+        # Guards against overlapping scan sequences while a worker thread runs
+        self._scan_in_progress = False
+        # Bumped whenever the measurement stores are replaced (new map or
+        # loaded session); results from an in-flight scan worker tagged with
+        # an older generation are dropped on arrival instead of landing in
+        # the fresh state with coordinates from the old map.
+        self._scan_generation = 0
+
         self.selected_interface = tk.StringVar()
         self.selected_ssid = tk.StringVar()
         self.interfaces_map = {}
@@ -180,20 +237,25 @@ class WifiHeatmapApp:
                     output_bytes = subprocess.check_output(['netsh', 'wlan', 'show', 'interfaces'], creationflags=subprocess.CREATE_NO_WINDOW)
                     output = output_bytes.decode('mbcs', errors='ignore')
                     current_name = None
+                    # Set lookup instead of scanning interfaces_map.values()
+                    # for every parsed adapter name
+                    seen_names = set()
                     for line in output.split('\n'):
                         stripped_line = line.strip()
                         if (stripped_line.startswith('Name') or stripped_line.startswith('Nombre')) and ':' in stripped_line:
-                            if current_name and current_name not in self.interfaces_map.values():
+                            if current_name and current_name not in seen_names:
                                 self.interfaces_map[current_name] = current_name
+                                seen_names.add(current_name)
                                 display_names.append(current_name)
                             current_name = stripped_line.split(':', 1)[1].strip()
                         elif current_name and (stripped_line.startswith('Description') or stripped_line.startswith('Descripci')) and ':' in stripped_line:
                             desc = stripped_line.split(':', 1)[1].strip()
                             display = f"{current_name} ({desc})"
                             self.interfaces_map[display] = current_name
+                            seen_names.add(current_name)
                             display_names.append(display)
                             current_name = None
-                    if current_name and current_name not in self.interfaces_map.values():
+                    if current_name and current_name not in seen_names:
                         self.interfaces_map[current_name] = current_name
                         display_names.append(current_name)
             elif self.os_name == 'Linux':
@@ -243,6 +305,7 @@ class WifiHeatmapApp:
             try:
                 img = Image.open(file_path).convert('RGB')
                 self.original_image = np.array(img)
+                self._image_b64 = None
                 self.img_height, self.img_width = self.original_image.shape[:2]
                 
                 logger.info(f"Map image successfully parsed and loaded into memory. Resolution: {self.img_width}x{self.img_height}")
@@ -250,6 +313,11 @@ class WifiHeatmapApp:
                 # Reset states
                 self.pixels_per_meter = None
                 self.measurements = []
+                self._measurement_idx = {}
+                self._all_ssids = set()
+                self._meas_x =[]
+                self._meas_y =[]
+                self._scan_generation += 1
                 self.calibration_points = []
                 self.update_ssid_dropdown()
 
@@ -271,16 +339,14 @@ class WifiHeatmapApp:
         self.fig.clf()
         self.ax = self.fig.add_subplot(111)
         self.ax.axis('off')
+        self._meas_line = None
         if self.original_image is not None:
             self.ax.imshow(self.original_image)
             
             h, w = self.img_height, self.img_width
             self.ax.plot([-0.5, w-0.5, w-0.5, -0.5, -0.5],[-0.5, -0.5, h-0.5, h-0.5, -0.5], color='black', linewidth=1.5)
             
-            if self.measurements:
-                x = [m['x'] for m in self.measurements]
-                y =[m['y'] for m in self.measurements]
-                self.ax.plot(x, y, 'ro', markersize=6, markeredgecolor='black')
+            self._meas_line, = self.ax.plot(self._meas_x, self._meas_y, **MEASUREMENT_MARKER)
                 
         self.fig.tight_layout()
         self.canvas.draw()
@@ -385,8 +451,17 @@ class WifiHeatmapApp:
         logger.info(f"Map clicked at pixel coordinates ({x}, {y}) during state: {self.state}")
         
         if self.state == 'CALIBRATING':
+            if self.calibration_points:
+                # Vectorized distance to every placed point; a repeat click
+                # would otherwise produce a zero pixel distance and a bogus
+                # 0 px/m calibration ratio.
+                pts = np.asarray(self.calibration_points, dtype=float)
+                if np.min(np.hypot(pts[:, 0] - x, pts[:, 1] - y)) < 1.0:
+                    logger.warning(f"Duplicate calibration point rejected at ({x}, {y}).")
+                    messagebox.showwarning("Calibration", "This point is too close to the previous one.\nPlease click a different location.")
+                    return
             self.calibration_points.append((x, y))
-            self.ax.plot(x, y, 'bx', markersize=10, markeredgewidth=2)
+            self.ax.plot(x, y, **CALIBRATION_MARKER)
             self.canvas.draw()
             
             if len(self.calibration_points) == 1:
@@ -420,48 +495,93 @@ class WifiHeatmapApp:
                 self.toggle_measuring()
                 return
 
+            if self._scan_in_progress:
+                logger.info("Scan sequence already running. Ignoring extra map click.")
+                return
+
             logger.info(f"Initiating Wi-Fi measurement sequence at map coordinate ({x}, {y}).")
             self.lbl_status.config(text="Status: SCANNING\n(Please wait...)")
             self.canvas.get_tk_widget().config(cursor="watch")
-            self.root.update()
-            
-            scans =[]
+            self._scan_in_progress = True
+            # Resolve the interface here: Tk variables are not safe to read
+            # from the worker thread.
+            threading.Thread(target=self._scan_worker,
+                             args=(x, y, self._scan_generation, display_name, interface),
+                             daemon=True).start()
+
+    def _scan_worker(self, x, y, generation, display_name, interface):
+        """Run the 3-pass scan sequence off the GUI thread so the window stays responsive."""
+        ssid_list =[]
+        signal_list =[]
+        freq_by_ssid = {}
+        try:
             for i in range(3):
                 logger.info(f"Executing scan pass {i+1} of 3...")
-                scan_res = self.scan_wifi_once()
-                scans.append(scan_res)
+                scan_res = self.scan_wifi_once(display_name, interface)
                 logger.info(f"Scan pass {i+1} completed. Found {len(scan_res)} networks.")
                 logger.info(f"Scan pass {i+1} results: {scan_res}")
+                # Accumulate readings in place rather than buffering the pass
+                # dicts and merging them afterwards.
+                for ssid, entry in scan_res.items():
+                    ssid_list.append(ssid)
+                    signal_list.append(entry['signal'])
+                    # Assume the frequency doesn't change meaningfully across the 3 rapid scans
+                    freq_by_ssid.setdefault(ssid, entry['freq'])
                 time.sleep(1)
-                
-            avg_scan = {}
-            all_ssids = set()
-            for s in scans:
-                all_ssids.update(s.keys())
-                
-            for ssid in all_ssids:
-                entries =[s[ssid] for s in scans if ssid in s]
-                avg_signal = int(sum(e['signal'] for e in entries) / len(entries))
-                
-                # Assume the frequency doesn't change meaningfully across the 3 rapid scans
-                freq = entries[0]['freq']
-                avg_scan[ssid] = {'signal': avg_signal, 'freq': freq}
-                
-            logger.info(f"Averaged scan results: {avg_scan}")
-            logger.info(f"Aggregated measurement generated at ({x}, {y}) for {len(avg_scan)} unique SSIDs.")
-            self.measurements.append({'x': x, 'y': y, 'ssids': avg_scan})
-            self.update_ssid_dropdown()
-            
-            self.ax.plot(x, y, 'ro', markersize=6, markeredgecolor='black')
-            self.canvas.draw()
-            
+        finally:
+            # Widgets may only be touched from the Tk main loop; hand the
+            # collected readings back via after().
+            try:
+                self.root.after(0, self._finish_measurement, x, y, generation, ssid_list, signal_list, freq_by_ssid)
+            except (RuntimeError, tk.TclError):
+                logger.info("Application closed before the scan sequence finished. Dropping results.")
+
+    def _finish_measurement(self, x, y, generation, ssid_list, signal_list, freq_by_ssid):
+        """Aggregate the collected readings and update the UI (main thread only)."""
+        self._scan_in_progress = False
+        if generation != self._scan_generation:
+            logger.info(f"Discarding scan results for ({x}, {y}): the map or session changed while scanning.")
+            return
+
+        avg_scan = {}
+        if ssid_list:
+            # Average in the physical linear power domain: % -> dBm -> mW,
+            # per-SSID mean, then back. One vectorized pass over every
+            # reading instead of per-SSID Python loops.
+            dbm = np.asarray(signal_list, dtype=float) * 60.0 / 100.0 - 100.0
+            mw = np.exp(dbm * (LN10 / 10.0))
+            unique_ssids, inverse = np.unique(np.asarray(ssid_list), return_inverse=True)
+            mean_mw = np.bincount(inverse, weights=mw) / np.bincount(inverse)
+            avg_dbm = 10.0 * np.log10(mean_mw)
+            avg_pct = np.clip(np.rint((avg_dbm + 100.0) * 100.0 / 60.0), 0, 100).astype(int)
+            for ssid, avg_signal in zip(unique_ssids, avg_pct):
+                avg_scan[str(ssid)] = {'signal': int(avg_signal), 'freq': freq_by_ssid[str(ssid)]}
+
+        logger.info(f"Averaged scan results: {avg_scan}")
+        logger.info(f"Aggregated measurement generated at ({x}, {y}) for {len(avg_scan)} unique SSIDs.")
+        self.measurements.append({'x': x, 'y': y, 'ssids': avg_scan})
+        self._meas_x.append(x)
+        self._meas_y.append(y)
+        self._index_measurement(x, y, avg_scan)
+        self.update_ssid_dropdown()
+
+        if self._meas_line is not None:
+            self._meas_line.set_data(self._meas_x, self._meas_y)
+        else:
+            self._meas_line, = self.ax.plot(self._meas_x, self._meas_y, **MEASUREMENT_MARKER)
+        self.canvas.draw_idle()
+
+        if self.state == 'MEASURING':
             self.lbl_status.config(text="Status: MEASURING\n(Click on map to measure)")
             self.canvas.get_tk_widget().config(cursor="target")
-            logger.info("Measurement sequence complete. Ready for next point.")
+        elif self.state == 'IDLE':
+            # Leave CALIBRATING alone: its status label and crosshair cursor
+            # belong to the calibration flow, not this scan.
+            self.lbl_status.config(text="Status: IDLE")
+            self.canvas.get_tk_widget().config(cursor="")
+        logger.info("Measurement sequence complete. Ready for next point.")
 
-    def scan_wifi_once(self):
-        display_name = self.selected_interface.get()
-        interface = self.interfaces_map.get(display_name, display_name)
+    def scan_wifi_once(self, display_name, interface):
         logger.info(f"Executing hardware Wi-Fi scan on interface '{display_name}'...")
         results = {}
 
@@ -474,7 +594,25 @@ class WifiHeatmapApp:
                 if HAS_PYWIFI and hasattr(interface, 'scan'):
                     logger.info("Utilizing PyWiFi library for Windows scanning.")
                     interface.scan()
-                    time.sleep(2.5) 
+                    # Wait for the adapter to leave the SCANNING state with
+                    # exponential backoff instead of a fixed 2.5s sleep.
+                    # scan_results() alone is no progress signal: it returns
+                    # the OS's cached BSS list, which is non-empty right after
+                    # scan() with readings from the previous scan. The early
+                    # exit is only trusted once the adapter was actually seen
+                    # scanning: a connected adapter on Windows keeps reporting
+                    # the connected state while it scans in the background, so
+                    # without that sighting we wait out the full deadline.
+                    deadline = time.monotonic() + 2.5
+                    delay = 0.1
+                    saw_scanning = False
+                    while time.monotonic() < deadline:
+                        time.sleep(min(delay, deadline - time.monotonic()))
+                        if interface.status() == pywifi_const.IFACE_SCANNING:
+                            saw_scanning = True
+                        elif saw_scanning:
+                            break
+                        delay = min(delay * 2, 0.8)
                     scan_res = interface.scan_results()
                     for network in scan_res:
                         ssid_val = network.ssid.strip()
@@ -598,15 +736,20 @@ class WifiHeatmapApp:
         logger.info(f"Hardware scan cycle complete. Processed {len(results)} networks.")
         return results
 
+    def _index_measurement(self, x, y, ssids):
+        """Record per-SSID readings under (x, y, ssid), keeping the strongest."""
+        for ssid, entry in ssids.items():
+            self._all_ssids.add(ssid)
+            key = (x, y, ssid)
+            prev = self._measurement_idx.get(key)
+            if prev is None or entry['signal'] > prev['signal']:
+                self._measurement_idx[key] = entry
+
     def update_ssid_dropdown(self):
         logger.info("Updating SSID dropdown with new measurement data.")
-        all_ssids = set()
-        for m in self.measurements:
-            all_ssids.update(m['ssids'].keys())
-        
-        ssids = sorted(list(all_ssids))
+        ssids = sorted(self._all_ssids)
         self.ssid_combo['values'] = ssids
-        if ssids and not self.selected_ssid.get() in ssids:
+        if ssids and self.selected_ssid.get() not in self._all_ssids:
             self.ssid_combo.current(0)
             logger.info(f"SSID dropdown refreshed. Total distinct networks: {len(ssids)}.")
         elif not ssids:
@@ -625,10 +768,13 @@ class WifiHeatmapApp:
             logger.info("Notifying user about caveats of hidden SSID processing.")
             messagebox.showinfo("Hidden Networks", "You are generating a heatmap for [Hidden SSID] networks.\n\nPlease note that multiple distinct hidden networks might be grouped together under this label.")
             
-        px =[m['x'] for m in self.measurements if ssid in m['ssids']]
-        py =[m['y'] for m in self.measurements if ssid in m['ssids']]
-        pz =[m['ssids'][ssid]['signal'] for m in self.measurements if ssid in m['ssids']]
-        pf = [m['ssids'][ssid]['freq'] for m in self.measurements if ssid in m['ssids']]
+        px, py, pz, pf =[],[],[],[]
+        for (mx, my, mssid), entry in self._measurement_idx.items():
+            if mssid == ssid:
+                px.append(mx)
+                py.append(my)
+                pz.append(entry['signal'])
+                pf.append(entry['freq'])
         
         if len(px) < 1:
             logger.warning(f"Heatmap generation aborted: Insufficient measurement points for SSID '{ssid}'.")
@@ -643,71 +789,117 @@ class WifiHeatmapApp:
             self.lbl_status.config(text="Status: Generating Heatmap...")
             self.root.update()
             
-            # Setup Grid
-            grid_x, grid_y = np.mgrid[0:self.img_width:200j, 0:self.img_height:200j]
-            logger.info(f"Mathematical interpolation grid constructed over {self.img_width}x{self.img_height} area.")
+            # Setup Grid. The step adapts to the image so the longest side gets
+            # at most HEATMAP_GRID_TARGET samples, keeping the grid aspect-true
+            # instead of a fixed 200x200 that over- or under-samples the map.
+            grid_step = max(1, -(-max(self.img_width, self.img_height) // HEATMAP_GRID_TARGET))
+            # Sparse axes broadcast against each other on demand, so the full
+            # dense X/Y coordinate matrices are never materialized. float32
+            # halves the bandwidth of every grid temporary below and is far
+            # more precision than a signal-percentage display needs.
+            grid_x, grid_y = np.meshgrid(np.arange(0, self.img_width, grid_step, dtype=np.float32),
+                                         np.arange(0, self.img_height, grid_step, dtype=np.float32),
+                                         sparse=True, indexing='ij')
+            grid_shape = (grid_x.shape[0], grid_y.shape[1])
+            logger.info(f"Mathematical interpolation grid constructed over {self.img_width}x{self.img_height} area (step={grid_step}px).")
 
-            # Initialize arrays for physical linear power (mW) tracking
-            Z_num = np.zeros(grid_x.shape, dtype=float)
-            W_sum = np.zeros(grid_x.shape, dtype=float)
             eps = 1e-6
 
             logger.info("Applying theoretical frequency propagation models based on Free-Space Path Loss formulas...")
 
-            for xi, yi, zi_percent, freq_mhz in zip(px, py, pz, pf):
-                # Back-convert unified % back to physical dBm
-                zi_dbm = (zi_percent * 60.0 / 100.0) - 100.0
+            # Vectorize over measurement points: the grid gains a trailing
+            # point axis so every step below broadcasts in C instead of
+            # looping point-by-point in Python.
+            pts_x = np.asarray(px, dtype=np.float32)
+            pts_y = np.asarray(py, dtype=np.float32)
+            pts_freq = np.asarray(pf, dtype=np.float32)
+
+            # Back-convert unified % back to physical dBm
+            pts_dbm = (np.asarray(pz, dtype=np.float32) * 60.0 / 100.0) - 100.0
+
+            # 1. Transmission Power anchor to align with calibration point
+            tx_power_dbm = 0.0
+
+            # 2. Reverse FSPL formula to find Virtual AP Distance
+            path_loss_db = tx_power_dbm - pts_dbm
+            log_freq = 20 * np.log10(pts_freq)
+            d_ap_km = np.exp((path_loss_db - log_freq - 32.44) * (LN10 / 20.0))
+
+            # Evaluate in chunks of points so peak memory stays bounded at
+            # grid_cells * chunk floats however many spots were measured.
+            # 8 points keeps each 512x512 float32 scratch buffer at ~8 MB.
+            chunk = 8
+            Z_num = np.zeros(grid_shape, dtype=np.float32)
+            W_sum = np.zeros(grid_shape, dtype=np.float32)
+
+            # Scratch buffers reused across chunks; each dense grid-sized
+            # temporary is written in place instead of reallocated per pass.
+            # The trailing axis never exceeds the real point count, so a
+            # handful of measurements only allocates a handful of planes.
+            n_scratch = min(chunk, len(pts_x))
+            dist_buf = np.empty(grid_shape + (n_scratch,), dtype=np.float32)
+            pred_buf = np.empty(grid_shape + (n_scratch,), dtype=np.float32)
+            w_buf = np.empty(grid_shape + (n_scratch,), dtype=np.float32)
+
+            for start in range(0, len(pts_x), chunk):
+                sl = slice(start, start + chunk)
+                n = min(chunk, len(pts_x) - start)
+                dist_m = dist_buf[..., :n]
+                pred = pred_buf[..., :n]
+                w = w_buf[..., :n]
+
+                dx = grid_x[..., np.newaxis] - pts_x[sl]
+                dy = grid_y[..., np.newaxis] - pts_y[sl]
+                np.add(dx*dx, dy*dy, out=dist_m)
+                np.sqrt(dist_m, out=dist_m)
+                if self.pixels_per_meter:
+                    dist_m /= self.pixels_per_meter
 
-                dx = grid_x - xi
-                dy = grid_y - yi
-                dist_px = np.sqrt(dx*dx + dy*dy)
-                
-                dist_m = dist_px / self.pixels_per_meter if self.pixels_per_meter else dist_px
-                
-                # 1. Transmission Power anchor to align with calibration point
-                tx_power_dbm = 0.0
-                
-                # 2. Reverse FSPL formula to find Virtual AP Distance
-                path_loss_db = tx_power_dbm - zi_dbm
-                d_ap_km = 10.0 ** ((path_loss_db - 20 * np.log10(freq_mhz) - 32.44) / 20.0)
-                
                 # 3. New Distance Simulation
-                d_total_km = d_ap_km + (dist_m / 1000.0)
-                
+                np.divide(dist_m, 1000.0, out=pred)
+                pred += d_ap_km[sl]
+
                 # 4. Forward FSPL calculation at the extended distance
-                loss_fspl = 20 * np.log10(d_total_km) + 20 * np.log10(freq_mhz) + 32.44
-                
-                # 5. Indoor Environment Absorption (forces realistic decay to < 40% & 0%)
-                indoor_penalty = 1.2 * dist_m
-                
-                # Dynamic signal prediction across the whole grid
-                predicted_dbm = tx_power_dbm - loss_fspl - indoor_penalty
-                
-                # Convert prediction back to physical linear power for IDW interpolation blending
-                predicted_mw = 10.0 ** (predicted_dbm / 10.0)
-                
+                np.log10(pred, out=pred)
+                pred *= 20.0
+                pred += log_freq[sl] + 32.44
+
+                # 5. Indoor Environment Absorption (forces realistic decay to
+                # < 40% & 0%): pred holds total loss, so the predicted dBm is
+                # tx - pred - 1.2*dist, converted back to linear power (mW)
+                # for IDW interpolation blending.
+                np.negative(pred, out=pred)
+                np.multiply(dist_m, 1.2, out=w)
+                pred -= w
+                pred += tx_power_dbm
+                pred *= LN10 / 10.0
+                np.exp(pred, out=pred)
+
                 # The energy density IDW blends everything with the square of the visual distance
-                with np.errstate(divide='ignore'):
-                    w = 1.0 / (dist_m**2 + eps)
+                np.multiply(dist_m, dist_m, out=w)
+                w += eps
+                np.reciprocal(w, out=w)
 
-                # Accumulate linear weighted values
-                Z_num += w * predicted_mw
-                W_sum += w
+                # Accumulate linear weighted values over the point axis
+                pred *= w
+                Z_num += np.sum(pred, axis=-1)
+                W_sum += np.sum(w, axis=-1)
 
             logger.info("Normalizing cumulative signal matrices and converting back to perceptual percentage...")
-            # Normalize linear power
-            with np.errstate(divide='ignore', invalid='ignore'):
-                grid_mw = Z_num / W_sum
-
-            # Convert physically blended signal back to dBm, then the UI-friendly unified Percentage
+            # Normalize linear power and convert straight back to dBm and the
+            # UI-friendly unified percentage in place: grid_z reuses the
+            # accumulator storage and each step is one fused pass instead of
+            # a chain of full-grid temporaries.
             with np.errstate(divide='ignore', invalid='ignore'):
-                grid_z_dbm = 10.0 * np.log10(grid_mw)
+                grid_z = np.divide(Z_num, W_sum, out=Z_num)
+                np.log10(grid_z, out=grid_z)
+            grid_z *= 10.0 * (100.0 / 60.0)
+            grid_z += 100.0 * (100.0 / 60.0)
+            # The lower clip bound is subsumed by the <35% transparency mask below
+            np.minimum(grid_z, 100.0, out=grid_z)
 
-            grid_z = (grid_z_dbm + 100.0) * 100.0 / 60.0
-            grid_z = np.clip(grid_z, 0.0, 100.0)
-            
             # Mask out uncalculated spots safely
-            grid_z[W_sum == 0] = np.nan  
+            grid_z[W_sum == 0] = np.nan
             
             # Mask out any value below 30% to render it completely transparent
             logger.info("Masking out areas below 30% signal strength to render them fully transparent.")
@@ -730,31 +922,19 @@ class WifiHeatmapApp:
         top = tk.Toplevel(self.root)
         top.title(f"Wifi Heatmap of {ssid}")
         top.geometry("800x650")
-        
-        fig, ax = plt.subplots(figsize=(8, 6))
+
+        # A plain Figure stays out of the pyplot figure registry, so each
+        # heatmap window is freed with its Toplevel instead of accumulating
+        # in pyplot's global state for the lifetime of the app.
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot(111)
         fig.patch.set_facecolor('white')
         ax.axis('off')
         
         ax.imshow(self.original_image)
 
-        # Matplotlib Color Map Definition:
-        # Values scale from [0.0 to 1.0] representing 0% to 100%.
-        # - > 75% Good signal
-        # - < 75% and > 50% Acceptable signal
-        # - < 50% and > 40% Weak signal
-        # - < 40% Unreliable signal
-        
-        colors_list =[
-            (0.00, 'black'),
-            (0.34, 'black'),
-            (0.35, 'red'),
-            (0.75, 'blue'),
-            (1.00, 'green')
-        ]
-        wifi_cmap = LinearSegmentedColormap.from_list('wifi_cmap', colors_list)
-
-        im = ax.imshow(grid_z.T, extent=(0, self.img_width, self.img_height, 0), origin='upper', alpha=0.6, cmap=wifi_cmap, vmin=0, vmax=100)
-        sc = ax.scatter(x, y, c=z, cmap=wifi_cmap, edgecolors='black', s=50, vmin=0, vmax=100)
+        im = ax.imshow(grid_z.T, extent=(0, self.img_width, self.img_height, 0), origin='upper', alpha=0.6, cmap=WIFI_CMAP, vmin=0, vmax=100)
+        sc = ax.scatter(x, y, c=z, cmap=WIFI_CMAP, edgecolors='black', s=50, vmin=0, vmax=100)
         cbar = fig.colorbar(im, ax=ax, label='Signal Strength (%)')
         
         # Add a help icon next to the legend (colorbar)
@@ -846,18 +1026,18 @@ class WifiHeatmapApp:
         if file_path:
             logger.info(f"Target file for session save: {file_path}")
             try:
-                image_b64 = None
-                if self.original_image is not None:
-                    logger.info("Encoding map image to base64 for embedding in session file...")
-                    img = Image.fromarray(self.original_image)
-                    buf = io.BytesIO()
-                    img.save(buf, format='PNG')
-                    image_b64 = base64.b64encode(buf.getvalue()).decode('ascii')
+                image_b64 = self._encoded_map_image()
                 
                 data = {
                     'image_base64': image_b64,
                     'pixels_per_meter': self.pixels_per_meter,
-                    'measurements': self.measurements
+                    'measurements': self.measurements,
+                    # Tuple keys can't be JSON object keys, so the index is
+                    # flattened to rows and rebuilt positionally on load.
+                    'measurement_index':[
+                       [mx, my, mssid, entry['signal'], entry['freq']]
+                        for (mx, my, mssid), entry in self._measurement_idx.items()
+                    ]
                 }
                 
                 logger.info("Writing JSON payload to disk...")
@@ -871,6 +1051,18 @@ class WifiHeatmapApp:
         else:
             logger.info("Save session cancelled by user.")
 
+    def _encoded_map_image(self):
+        """Return the current map as a base64 PNG, encoding it at most once."""
+        if self.original_image is None:
+            return None
+        if self._image_b64 is None:
+            logger.info("Encoding map image to base64 for embedding in session file...")
+            img = Image.fromarray(self.original_image)
+            buf = io.BytesIO()
+            img.save(buf, format='PNG')
+            self._image_b64 = base64.b64encode(buf.getvalue()).decode('ascii')
+        return self._image_b64
+
     def load_session(self):
         logger.info("User requested to load an existing session file. Opening file dialog...")
         file_path = filedialog.askopenfilename(filetypes=[("JSON Files", "*.json")])
@@ -886,6 +1078,9 @@ class WifiHeatmapApp:
                     img_bytes = base64.b64decode(image_b64)
                     img = Image.open(io.BytesIO(img_bytes)).convert('RGB')
                     self.original_image = np.array(img)
+                    # The session file already carries the encoded form; keep
+                    # it so a later save doesn't redo the PNG encode.
+                    self._image_b64 = image_b64
                     self.img_height, self.img_width = self.original_image.shape[:2]
                     self.image_path = None
                     logger.info(f"Map image loaded successfully. Dimensions: ({self.img_width}x{self.img_height})")
@@ -895,6 +1090,21 @@ class WifiHeatmapApp:
                     
                 self.pixels_per_meter = data.get('pixels_per_meter')
                 self.measurements = data.get('measurements',[])
+                self._measurement_idx = {}
+                self._all_ssids = set()
+                self._meas_x =[m['x'] for m in self.measurements]
+                self._meas_y =[m['y'] for m in self.measurements]
+                self._scan_generation += 1
+                saved_idx = data.get('measurement_index')
+                if saved_idx is not None:
+                    # Newer sessions carry the index directly, so restoring
+                    # skips re-aggregating the whole measurement history.
+                    for mx, my, mssid, signal, freq in saved_idx:
+                        self._measurement_idx[(mx, my, mssid)] = {'signal': signal, 'freq': freq}
+                        self._all_ssids.add(mssid)
+                else:
+                    for m in self.measurements:
+                        self._index_measurement(m['x'], m['y'], m['ssids'])
                 
                 if self.original_image is not None:
                     logger.info("Redrawing GUI map view with loaded image payload.")